@@ -0,0 +1,159 @@
+import struct
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Fall back to the pure-Python parser below
+    njit = None
+
+# Witmotion frame layout: 0x55, type byte, 8 payload bytes (four little-endian
+# int16), checksum (low byte of the sum of the first 10 bytes)
+FRAME_SIZE = 11
+ACCEL_FRAME = 0x51
+GYRO_FRAME = 0x52
+
+# Scale factors from the Witmotion protocol: +/-16 g accel range, +/-2000 deg/s gyro range
+ACCEL_SCALE = 16 * 9.8 / 32768
+GYRO_SCALE = 2000 / 32768
+
+# Payload after the header: x, y, z, and a temperature/voltage word we ignore.
+# Compiled once so the fallback parser decodes each frame in a single C call
+# instead of building Python ints field by field.
+_PAYLOAD = struct.Struct('<hhhh')
+
+
+def _parse_frames_py(buf, acc_buf, gyr_buf, n):
+    """Pure-Python fallback for parse_frames, used when numba is unavailable.
+
+    Mirrors the jitted parser's semantics but decodes each payload with a
+    precompiled struct format.
+    """
+    i = 0
+    size = buf.shape[0]
+    capacity = acc_buf.shape[0]
+    have_accel = False
+    accel_start = 0
+    ax = ay = az = 0
+
+    while i + FRAME_SIZE <= size:
+        if buf[i] != 0x55:
+            i += 1
+            continue
+        frame_type = buf[i + 1]
+        if frame_type != ACCEL_FRAME and frame_type != GYRO_FRAME:
+            i += 1
+            continue
+
+        if (int(buf[i:i + FRAME_SIZE - 1].sum()) & 0xFF) != buf[i + FRAME_SIZE - 1]:
+            i += 1
+            continue
+
+        x, y, z, _ = _PAYLOAD.unpack_from(buf, i + 2)
+
+        if frame_type == ACCEL_FRAME:
+            ax, ay, az = x, y, z
+            have_accel = True
+            accel_start = i
+        elif have_accel and n < capacity:
+            acc_buf[n, 0] = ax
+            acc_buf[n, 1] = ay
+            acc_buf[n, 2] = az
+            gyr_buf[n, 0] = x
+            gyr_buf[n, 1] = y
+            gyr_buf[n, 2] = z
+            n += 1
+            have_accel = False
+
+        i += FRAME_SIZE
+
+    # Don't consume a trailing accel frame whose gyro partner hasn't
+    # arrived yet; it stays in the tail and pairs up on the next call
+    if have_accel:
+        return n, accel_start
+    return n, i
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _read_int16(buf, idx):
+        """Decode a little-endian int16 from two unsigned bytes."""
+        value = np.int64(buf[idx]) | (np.int64(buf[idx + 1]) << 8)
+        if value >= 32768:
+            value -= 65536
+        return value
+
+    @njit(cache=True, fastmath=True)
+    def parse_frames(buf, acc_buf, gyr_buf, n):
+        """
+        Decode all complete Witmotion frames in buf and append paired accel/gyro
+        samples to the preallocated buffers starting at index n.
+
+        Walks the byte buffer once, validating the 0x55 header and checksum of
+        each frame and fusing the accel and gyro decodes into a single pass. A
+        sample is recorded when a gyro frame follows a decoded accel frame, so
+        both buffers stay index-aligned. Samples are stored as raw int16 counts;
+        the ACCEL_SCALE/GYRO_SCALE conversion and the timestamp grid are both
+        generated by the caller in vectorized passes after collection.
+
+        Args:
+            buf (np.ndarray): uint8 array of raw serial bytes
+            acc_buf (np.ndarray): preallocated (capacity, 3) int16 accel buffer
+            gyr_buf (np.ndarray): preallocated (capacity, 3) int16 gyro buffer
+            n (int): number of samples already in the buffers
+
+        Returns:
+            Tuple[int, int]: updated sample count and number of bytes consumed
+                             (the residual tail may hold a partial frame)
+        """
+        i = 0
+        size = buf.shape[0]
+        capacity = acc_buf.shape[0]
+        have_accel = False
+        accel_start = 0
+        ax = ay = az = np.int64(0)
+
+        while i + FRAME_SIZE <= size:
+            if buf[i] != 0x55:
+                i += 1
+                continue
+            frame_type = buf[i + 1]
+            if frame_type != ACCEL_FRAME and frame_type != GYRO_FRAME:
+                i += 1
+                continue
+
+            checksum = np.int64(0)
+            for j in range(FRAME_SIZE - 1):
+                checksum += buf[i + j]
+            if (checksum & 0xFF) != buf[i + FRAME_SIZE - 1]:
+                i += 1
+                continue
+
+            x = _read_int16(buf, i + 2)
+            y = _read_int16(buf, i + 4)
+            z = _read_int16(buf, i + 6)
+
+            if frame_type == ACCEL_FRAME:
+                ax = x
+                ay = y
+                az = z
+                have_accel = True
+                accel_start = i
+            elif have_accel and n < capacity:
+                acc_buf[n, 0] = ax
+                acc_buf[n, 1] = ay
+                acc_buf[n, 2] = az
+                gyr_buf[n, 0] = x
+                gyr_buf[n, 1] = y
+                gyr_buf[n, 2] = z
+                n += 1
+                have_accel = False
+
+            i += FRAME_SIZE
+
+        # Don't consume a trailing accel frame whose gyro partner hasn't
+        # arrived yet; it stays in the tail and pairs up on the next call
+        if have_accel:
+            return n, accel_start
+        return n, i
+else:
+    parse_frames = _parse_frames_py
@@ -14,7 +14,7 @@ def main():
     analyzer = VibrationAnalyzer(sampling_rate=SAMPLING_RATE)
     
     # Initialize and connect to the Witmotion device
-    device = WitmotionDevice(serial_device=SERIAL_DEVICE)
+    device = WitmotionDevice(serial_device=SERIAL_DEVICE, sampling_rate=SAMPLING_RATE)
     if not device.connect():
         print("Failed to connect to device. Exiting...")
         return
@@ -27,33 +27,23 @@ def main():
             duration=COLLECTION_DURATION
         )
         
-        if not acceleration_data or not gyroscope_data:
+        if len(acceleration_data) == 0 or len(gyroscope_data) == 0:
             print("No data collected. Exiting...")
             return
-            
-        # Convert data to numpy arrays
-        acceleration_array = np.array(acceleration_data)
-        gyroscope_array = np.array(gyroscope_data)
-        
-        # Ensure both arrays have the same length by using the shorter one
-        min_length = min(len(acceleration_array), len(gyroscope_array))
-        acceleration_array = acceleration_array[:min_length]
-        gyroscope_array = gyroscope_array[:min_length]
-        timestamps = timestamps[:min_length]
-        
-        print(f"Using {min_length} data points for analysis")
-        
-        # Prepare data for analysis
+
+        print(f"Using {len(timestamps)} data points for analysis")
+
+        # Prepare data for analysis (buffers are already contiguous arrays)
         accel_data = {
-            'X': acceleration_array[:, 0],
-            'Y': acceleration_array[:, 1],
-            'Z': acceleration_array[:, 2]
+            'X': acceleration_data[:, 0],
+            'Y': acceleration_data[:, 1],
+            'Z': acceleration_data[:, 2]
         }
-        
+
         gyro_data = {
-            'X': gyroscope_array[:, 0],
-            'Y': gyroscope_array[:, 1],
-            'Z': gyroscope_array[:, 2]
+            'X': gyroscope_data[:, 0],
+            'Y': gyroscope_data[:, 1],
+            'Z': gyroscope_data[:, 2]
         }
         
         # Analyze both acceleration and gyroscope data
@@ -68,7 +58,9 @@ def main():
         for axis in ['X', 'Y', 'Z']:
             print(f"\n{axis}-axis:")
             freq, magnitude = accel_fft[axis]
-            peak_indices = np.argsort(magnitude)[-3:]  # Get top 3 peaks
+            k = min(3, len(magnitude))  # Get top 3 peaks (O(N)), clamped for short spectra
+            peak_indices = np.argpartition(magnitude, -k)[-k:]
+            peak_indices = peak_indices[np.argsort(magnitude[peak_indices])[::-1]]
             for idx in peak_indices:
                 print(f"  {freq[idx]:.2f} Hz (magnitude: {magnitude[idx]:.2f})")
         
@@ -76,7 +68,9 @@ def main():
         for axis in ['X', 'Y', 'Z']:
             print(f"\n{axis}-axis:")
             freq, magnitude = gyro_fft[axis]
-            peak_indices = np.argsort(magnitude)[-3:]  # Get top 3 peaks
+            k = min(3, len(magnitude))  # Get top 3 peaks (O(N)), clamped for short spectra
+            peak_indices = np.argpartition(magnitude, -k)[-k:]
+            peak_indices = peak_indices[np.argsort(magnitude[peak_indices])[::-1]]
             for idx in peak_indices:
                 print(f"  {freq[idx]:.2f} Hz (magnitude: {magnitude[idx]:.2f})")
                 
@@ -1,11 +1,10 @@
 import numpy as np
-from scipy.fft import fft
-import matplotlib
-matplotlib.use('Qt5Agg')  # Set the backend before importing pyplot
-import matplotlib.pyplot as plt
+from scipy.fft import rfft, rfftfreq, next_fast_len, set_workers
 from typing import List, Tuple, Dict
 import os
 
+from fft_kernels import batch_rfft_abs, SMALL_N_THRESHOLD
+
 class VibrationAnalyzer:
     def __init__(self, sampling_rate: float = 10.0):
         """
@@ -18,6 +17,44 @@ class VibrationAnalyzer:
         # Create output directory for plots
         self.output_dir = "plots"
         os.makedirs(self.output_dir, exist_ok=True)
+        # Figures are built lazily on the first plot call and reused across
+        # runs; only the line data is updated on repeat calls
+        self._fig_accel = None
+        self._fig_gyro = None
+        self._accel_time_lines = []
+        self._accel_fft_lines = []
+        self._accel_fft_axes = []
+        self._gyro_time_lines = []
+        self._gyro_fft_lines = []
+        self._gyro_fft_axes = []
+        self._peak_artists = []
+        # Frequency arrays only depend on (padded length, sampling rate), so
+        # cache them across analyses
+        self._freq_cache = {}
+        # Hann windows are cached per length and applied in place
+        self._window_cache = {}
+        # Magnitude output buffers are cached per padded length so np.abs
+        # writes into a reused float32 buffer instead of allocating
+        self._mag_cache = {}
+        # pyplot is imported lazily so compute-only use never pays the
+        # matplotlib/Qt startup cost
+        self._plt = None
+
+    def _get_mag_buf(self, m: int) -> np.ndarray:
+        """Return the cached (6, m // 2 + 1) float32 magnitude buffer."""
+        buf = self._mag_cache.get(m)
+        if buf is None:
+            buf = self._mag_cache[m] = np.empty((6, m // 2 + 1), dtype=np.float32)
+        return buf
+
+    def _get_pyplot(self):
+        """Import matplotlib on first use and cache the pyplot module."""
+        if self._plt is None:
+            import matplotlib
+            matplotlib.use('Qt5Agg')  # Set the backend before importing pyplot
+            import matplotlib.pyplot as plt
+            self._plt = plt
+        return self._plt
         
     def compute_fft(self, time_series: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -29,119 +66,134 @@ class VibrationAnalyzer:
         Returns:
             Tuple[np.ndarray, np.ndarray]: Frequency array and magnitude array
         """
-        # Compute FFT
-        fft_result = fft(time_series)
-        
-        # Compute frequency array
+        # Compute real FFT (input is real-valued, so the negative half of the
+        # spectrum is redundant; rfft does half the work of a full fft)
+        fft_result = rfft(np.asarray(time_series, dtype=np.float32), workers=-1)
+
+        # Compute frequency array (rfft already returns only non-negative bins)
         n = len(time_series)
-        freq = np.fft.fftfreq(n, 1/self.sampling_rate)
-        
+        freq = rfftfreq(n, 1/self.sampling_rate)
+
         # Compute magnitude spectrum
         magnitude = np.abs(fft_result)
-        
-        # Only return positive frequencies
-        positive_freq_mask = freq >= 0
-        return freq[positive_freq_mask], magnitude[positive_freq_mask]
+
+        return freq, magnitude
     
-    def plot_all_data(self, accel_data: Dict[str, Tuple[np.ndarray, np.ndarray]], 
-                     gyro_data: Dict[str, Tuple[np.ndarray, np.ndarray]]):
-        """
-        Plot time series and FFT analysis for both acceleration and gyroscope data.
-        
-        Args:
-            accel_data (Dict[str, Tuple[np.ndarray, np.ndarray]]): Dictionary containing timestamps and time series data for acceleration
-            gyro_data (Dict[str, Tuple[np.ndarray, np.ndarray]]): Dictionary containing timestamps and time series data for gyroscope
+    def _build_figure(self, title: str, ylabel: str, color: str):
+        """Create one analysis figure with time-series and FFT subplot rows.
+
+        The accel and gyro figures share this builder; only the suptitle,
+        time-series ylabel, and line color differ.
         """
-        # Create figure with subplots for acceleration data
-        fig_accel = plt.figure(figsize=(15, 10))
-        fig_accel.suptitle('Acceleration Data Analysis', fontsize=16)
-        
-        # Create subplots for acceleration time series
-        ax1 = fig_accel.add_subplot(231)
-        ax2 = fig_accel.add_subplot(232)
-        ax3 = fig_accel.add_subplot(233)
-        
-        # Create subplots for acceleration FFT
-        ax4 = fig_accel.add_subplot(234)
-        ax5 = fig_accel.add_subplot(235)
-        ax6 = fig_accel.add_subplot(236)
-        
-        # Plot acceleration data
-        for i, (axis, (timestamps, time_series)) in enumerate(accel_data.items()):
-            ax = [ax1, ax2, ax3][i]
-            ax.plot(timestamps, time_series, 'b-', label=f'{axis}-axis')
-            ax.set_xlabel('Time (s)')
-            ax.set_ylabel('Acceleration (g)')
-            ax.set_title(f'Time Series - {axis}-axis')
-            ax.grid(True)
-            ax.legend()
-            
-            # Compute and plot FFT
-            freq, magnitude = self.compute_fft(time_series)
-            ax_fft = [ax4, ax5, ax6][i]
-            ax_fft.plot(freq, magnitude, 'r-', label='FFT')
-            ax_fft.set_xlabel('Frequency (Hz)')
-            ax_fft.set_ylabel('Magnitude')
-            ax_fft.set_title(f'Frequency Spectrum - {axis}-axis')
-            ax_fft.grid(True)
-            ax_fft.legend()
-            
-            # Mark dominant frequencies
-            peak_indices = np.argsort(magnitude)[-3:]  # Get top 3 peaks
-            for idx in peak_indices:
-                ax_fft.plot(freq[idx], magnitude[idx], 'go', markersize=10)
-                ax_fft.annotate(f'{freq[idx]:.1f} Hz',
-                              xy=(freq[idx], magnitude[idx]),
-                              xytext=(10, 10),
-                              textcoords='offset points')
-        
-        plt.tight_layout()
-        
-        # Create figure with subplots for gyroscope data
-        fig_gyro = plt.figure(figsize=(15, 10))
-        fig_gyro.suptitle('Gyroscope Data Analysis', fontsize=16)
-        
-        # Create subplots for gyroscope time series
-        ax1 = fig_gyro.add_subplot(231)
-        ax2 = fig_gyro.add_subplot(232)
-        ax3 = fig_gyro.add_subplot(233)
-        
-        # Create subplots for gyroscope FFT
-        ax4 = fig_gyro.add_subplot(234)
-        ax5 = fig_gyro.add_subplot(235)
-        ax6 = fig_gyro.add_subplot(236)
-        
-        # Plot gyroscope data
-        for i, (axis, (timestamps, time_series)) in enumerate(gyro_data.items()):
-            ax = [ax1, ax2, ax3][i]
-            ax.plot(timestamps, time_series, 'g-', label=f'{axis}-axis')
+        plt = self._get_pyplot()
+        fig = plt.figure(figsize=(15, 10))
+        fig.suptitle(title, fontsize=16)
+        time_lines = []
+        fft_lines = []
+        fft_axes = []
+
+        for i, axis in enumerate(['X', 'Y', 'Z']):
+            # Time series subplot (top row)
+            ax = fig.add_subplot(2, 3, i + 1)
+            line, = ax.plot([], [], color, label=f'{axis}-axis')
             ax.set_xlabel('Time (s)')
-            ax.set_ylabel('Angular Velocity (deg/s)')
+            ax.set_ylabel(ylabel)
             ax.set_title(f'Time Series - {axis}-axis')
             ax.grid(True)
             ax.legend()
-            
-            # Compute and plot FFT
-            freq, magnitude = self.compute_fft(time_series)
-            ax_fft = [ax4, ax5, ax6][i]
-            ax_fft.plot(freq, magnitude, 'r-', label='FFT')
+            time_lines.append(line)
+
+            # FFT subplot (bottom row)
+            ax_fft = fig.add_subplot(2, 3, i + 4)
+            fft_line, = ax_fft.plot([], [], 'r-', label='FFT')
             ax_fft.set_xlabel('Frequency (Hz)')
             ax_fft.set_ylabel('Magnitude')
             ax_fft.set_title(f'Frequency Spectrum - {axis}-axis')
             ax_fft.grid(True)
             ax_fft.legend()
-            
-            # Mark dominant frequencies
-            peak_indices = np.argsort(magnitude)[-3:]  # Get top 3 peaks
-            for idx in peak_indices:
-                ax_fft.plot(freq[idx], magnitude[idx], 'go', markersize=10)
-                ax_fft.annotate(f'{freq[idx]:.1f} Hz',
-                              xy=(freq[idx], magnitude[idx]),
-                              xytext=(10, 10),
-                              textcoords='offset points')
-        
-        plt.tight_layout()
-        plt.show(block=True)  # This will block until the window is closed
+            fft_lines.append(fft_line)
+            fft_axes.append(ax_fft)
+
+        return fig, time_lines, fft_lines, fft_axes
+
+    @staticmethod
+    def _update_line(line, x, y):
+        """Update a cached Line2D and rescale its axes to the new data."""
+        line.set_data(x, y)
+        ax = line.axes
+        ax.relim()
+        ax.autoscale_view()
+
+    def plot_all_data(self, accel_data: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                     gyro_data: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                     accel_fft: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                     gyro_fft: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                     block: bool = True):
+        """
+        Plot time series and FFT analysis for both acceleration and gyroscope data.
+
+        Figures and axes are created on the first call and reused afterwards;
+        repeat calls only push new data into the cached line handles instead
+        of rebuilding the Qt widgets. The FFT results are taken as computed
+        by analyze_vibration, so this method only plots.
+
+        Args:
+            accel_data (Dict[str, Tuple[np.ndarray, np.ndarray]]): Dictionary containing timestamps and time series data for acceleration
+            gyro_data (Dict[str, Tuple[np.ndarray, np.ndarray]]): Dictionary containing timestamps and time series data for gyroscope
+            accel_fft (Dict[str, Tuple[np.ndarray, np.ndarray]]): Frequency and magnitude arrays per acceleration axis
+            gyro_fft (Dict[str, Tuple[np.ndarray, np.ndarray]]): Frequency and magnitude arrays per gyroscope axis
+            block (bool): Whether to block until the plot windows are closed
+        """
+        if self._fig_accel is None:
+            (self._fig_accel, self._accel_time_lines,
+             self._accel_fft_lines, self._accel_fft_axes) = self._build_figure(
+                'Acceleration Data Analysis', 'Acceleration (g)', 'b-')
+        if self._fig_gyro is None:
+            (self._fig_gyro, self._gyro_time_lines,
+             self._gyro_fft_lines, self._gyro_fft_axes) = self._build_figure(
+                'Gyroscope Data Analysis', 'Angular Velocity (deg/s)', 'g-')
+
+        # Drop the peak markers/annotations from the previous call
+        for artist in self._peak_artists:
+            artist.remove()
+        self._peak_artists = []
+
+        # One data-driven pass over both figures instead of two copies of
+        # the same plotting block
+        for fig, time_lines, fft_lines, fft_axes, data_dict, fft_dict in (
+                (self._fig_accel, self._accel_time_lines, self._accel_fft_lines,
+                 self._accel_fft_axes, accel_data, accel_fft),
+                (self._fig_gyro, self._gyro_time_lines, self._gyro_fft_lines,
+                 self._gyro_fft_axes, gyro_data, gyro_fft)):
+            for i, (axis, (timestamps, time_series)) in enumerate(data_dict.items()):
+                self._update_line(time_lines[i], timestamps, time_series)
+
+                # Plot the precomputed FFT
+                freq, magnitude = fft_dict[axis]
+                self._update_line(fft_lines[i], freq, magnitude)
+                ax_fft = fft_axes[i]
+
+                # Mark dominant frequencies: one scatter artist for all peaks
+                # instead of one plot call per peak
+                k = min(3, len(magnitude))  # Get top 3 peaks (O(N)), clamped for short spectra
+                peak_indices = np.argpartition(magnitude, -k)[-k:]
+                peak_indices = peak_indices[np.argsort(magnitude[peak_indices])[::-1]]
+                peak_freqs = freq[peak_indices]
+                peak_mags = magnitude[peak_indices]
+                markers = ax_fft.scatter(peak_freqs, peak_mags, s=100, c='g', zorder=5)
+                labels = [ax_fft.annotate(f'{f:.1f} Hz', xy=(f, m),
+                                          xytext=(10, 10), textcoords='offset points')
+                          for f, m in zip(peak_freqs, peak_mags)]
+                self._peak_artists.append(markers)
+                self._peak_artists.extend(labels)
+
+            fig.tight_layout()
+        plt = self._get_pyplot()
+        if block:
+            plt.show(block=True)  # This will block until the window is closed
+        else:
+            plt.show(block=False)
+            plt.pause(0.001)  # Let the event loop draw without blocking
         
     def analyze_vibration(self, timestamps: np.ndarray, accel_data: Dict[str, np.ndarray], 
                          gyro_data: Dict[str, np.ndarray], plot: bool = True) -> Tuple[Dict[str, Tuple[np.ndarray, np.ndarray]], 
@@ -159,15 +211,55 @@ class VibrationAnalyzer:
             Tuple[Dict[str, Tuple[np.ndarray, np.ndarray]], Dict[str, Tuple[np.ndarray, np.ndarray]]]: 
                 FFT results for both acceleration and gyroscope data
         """
-        # Prepare data for plotting
-        accel_plot_data = {axis: (timestamps, data) for axis, data in accel_data.items()}
-        gyro_plot_data = {axis: (timestamps, data) for axis, data in gyro_data.items()}
-        
+        # Stack all six channels and compute their FFTs in one batched call,
+        # amortizing plan lookup and dispatch overhead across the transforms
+        stacked = np.stack([accel_data['X'], accel_data['Y'], accel_data['Z'],
+                            gyro_data['X'], gyro_data['Y'], gyro_data['Z']]).astype(np.float32)
+        n = stacked.shape[1]
+
+        # Apply a Hann window in place to suppress spectral leakage; the
+        # window is cached per length and the out= multiply reuses the
+        # stacked buffer, so no extra allocation
+        window = self._window_cache.setdefault(n, np.hanning(n).astype(np.float32))
+        np.multiply(stacked, window[None, :], out=stacked)
+
+        if n < SMALL_N_THRESHOLD:
+            # Small batch: scipy's thread-pool startup would dominate, so pad
+            # to a power of two and run the jitted radix-2 kernel with one
+            # prange thread per channel
+            m = 1 << max(n - 1, 1).bit_length()
+            if m != n:
+                stacked = np.pad(stacked, ((0, 0), (0, m - n)))
+            spectrum = self._get_mag_buf(m)
+            batch_rfft_abs(stacked, spectrum)
+        else:
+            # Zero-pad to the next fast length so pocketfft gets a friendly
+            # factorization instead of whatever count the collection produced
+            m = next_fast_len(n, real=True)
+            if m != n:
+                stacked = np.pad(stacked, ((0, 0), (0, m - n)))
+
+            # float32 input keeps pocketfft in complex64, and np.abs writes
+            # into the cached buffer instead of allocating float64 output
+            with set_workers(os.cpu_count()):
+                spec = rfft(stacked, axis=1)
+            spectrum = self._get_mag_buf(m)
+            np.abs(spec, out=spectrum)
+
+        freq_key = (m, self.sampling_rate)
+        freq = self._freq_cache.get(freq_key)
+        if freq is None:
+            freq = self._freq_cache[freq_key] = rfftfreq(m, 1/self.sampling_rate)
+
+        # Split rows back into per-axis results
+        accel_fft_results = {axis: (freq, spectrum[i]) for i, axis in enumerate(['X', 'Y', 'Z'])}
+        gyro_fft_results = {axis: (freq, spectrum[i + 3]) for i, axis in enumerate(['X', 'Y', 'Z'])}
+
+        # Plot from the results computed above instead of transforming again
         if plot:
-            self.plot_all_data(accel_plot_data, gyro_plot_data)
-            
-        # Compute FFT for all axes
-        accel_fft_results = {axis: self.compute_fft(data) for axis, data in accel_data.items()}
-        gyro_fft_results = {axis: self.compute_fft(data) for axis, data in gyro_data.items()}
-        
+            accel_plot_data = {axis: (timestamps, data) for axis, data in accel_data.items()}
+            gyro_plot_data = {axis: (timestamps, data) for axis, data in gyro_data.items()}
+            self.plot_all_data(accel_plot_data, gyro_plot_data,
+                               accel_fft_results, gyro_fft_results)
+
         return accel_fft_results, gyro_fft_results 
\ No newline at end of file
@@ -1,19 +1,30 @@
+import os
+import select
 import serial
-import pywitmotion as wit
 import numpy as np
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple
 import time
 
+from frame_parser import parse_frames, ACCEL_SCALE, GYRO_SCALE
+
+# On-disk record layout for capture files: one int16 triplet each for
+# acceleration and gyroscope raw counts (12 bytes per sample)
+CAPTURE_DTYPE = np.dtype([('a', '<i2', 3), ('g', '<i2', 3)])
+
 class WitmotionDevice:
-    def __init__(self, serial_device: str = "/dev/rfcomm0"):
+    def __init__(self, serial_device: str = "/dev/rfcomm0", sampling_rate: float = 10.0):
         """
         Initialize the Witmotion device connection.
-        
+
         Args:
             serial_device (str): Path to the serial device (default: "/dev/rfcomm0")
+            sampling_rate (float): Expected device output rate in Hz, used to size
+                                   collection buffers (default: 10.0)
         """
         self.serial_device = serial_device
+        self.sampling_rate = sampling_rate
         self.serial = None
+        self._fd = None
         self.connected = False
         
     def connect(self) -> bool:
@@ -26,7 +37,10 @@ class WitmotionDevice:
         try:
             print(f"Connecting to Witmotion device on {self.serial_device}...")
             self.serial = serial.Serial(self.serial_device, 115200, timeout=1)
-            
+            # Cache the raw file descriptor so the collect loop can wait on
+            # it with select() and read it without pyserial overhead
+            self._fd = self.serial.fileno()
+
             # Wait for connection to stabilize
             time.sleep(1)
             
@@ -42,59 +56,112 @@ class WitmotionDevice:
         """Disconnect from the device."""
         if self.serial and self.serial.is_open:
             self.serial.close()
+            self._fd = None
             self.connected = False
             
-    def collect_data(self, duration: float) -> Tuple[np.ndarray, List[float], List[float]]:
+    def collect_data(self, duration: float,
+                     capture_file: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Collect both acceleration and gyroscope data from the device for a specified duration.
-        
+
         Args:
             duration (float): Duration to collect data in seconds
-            
+            capture_file (Optional[str]): If given, raw samples are streamed to
+                this file during collection and the returned arrays are backed
+                by a memory map of it, so collection memory stays constant no
+                matter how long the capture runs
+
         Returns:
-            Tuple[np.ndarray, List[float], List[float]]: Array of timestamps, list of acceleration data points,
-                                                        and list of gyroscope data points
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Array of timestamps, (n, 3) array of
+                                                       acceleration samples, and (n, 3) array
+                                                       of gyroscope samples
         """
         if not self.connected:
             raise RuntimeError("Device not connected")
-            
-        timestamps = []
-        acceleration_points = []
-        gyroscope_points = []
-        angle_points = []
-        mag_points = []
-        q_points = []
-        start_time = time.time()
-        
+
+        # Preallocate buffers with headroom so the read loop never appends;
+        # grown geometrically if the device outputs faster than expected.
+        # Samples are kept as raw int16 counts during collection (a quarter
+        # of the float64 footprint) and scaled once afterwards. When streaming
+        # to a capture file only a small chunk buffer lives in RAM.
+        if capture_file is not None:
+            capacity = 4096
+            cap_fd = os.open(capture_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        else:
+            capacity = int(duration * self.sampling_rate * 2) + 64
+            cap_fd = None
+        acc_buf = np.empty((capacity, 3), dtype=np.int16)
+        gyr_buf = np.empty((capacity, 3), dtype=np.int16)
+        n = 0
+        total_written = 0
+        pending = bytearray()
+        start_time = time.monotonic()
+        deadline = start_time + duration
+
         print(f"Collecting data for {duration} seconds...")
-        
-        while time.time() - start_time < duration:
+
+        while time.monotonic() < deadline:
             try:
-                if self.serial.in_waiting:
-                    data = self.serial.read_until(b'U')
-                    if data:
-                        # Get acceleration data
-                        accel = wit.get_acceleration(data)
-                        # Get gyroscope data
-                        gyro = wit.get_gyro(data)
-                        # # Get angle data
-                        # angle = wit.get_angle(data)
-                        # # Get magnetometer data
-                        # mag = wit.get_magnetic(data)
-                        # # Get quaternion data
-                        # q = wit.get_quaternion(data)
-                        
-                        if accel is not None and gyro is not None:
-                            current_time = time.time() - start_time
-                            timestamps.append(current_time)
-                            acceleration_points.append(accel)
-                            gyroscope_points.append(gyro)
-                            # angle_points.append(angle)
-                            # mag_points.append(mag)
-                            # q_points.append(q)
+                # Block on the raw descriptor until data arrives (or a short
+                # timeout so the deadline stays responsive), then drain the
+                # kernel buffer in one read -- no polling, no pyserial
+                # property overhead per iteration
+                readable, _, _ = select.select([self._fd], [], [], 0.02)
+                if not readable:
+                    continue
+                pending.extend(os.read(self._fd, 4096))
+
+                # Grow the buffers if this chunk could overflow them
+                while capacity - n < len(pending) // 11 + 1:
+                    capacity *= 2
+                    acc_buf = np.resize(acc_buf, (capacity, 3))
+                    gyr_buf = np.resize(gyr_buf, (capacity, 3))
+
+                # Decode all complete frames in one jitted pass and keep the
+                # residual tail (a possibly partial frame) for the next read.
+                # Parse from an immutable snapshot: a view directly on the
+                # bytearray would hold a buffer export and make the resize
+                # below raise BufferError
+                raw = np.frombuffer(bytes(pending), dtype=np.uint8)
+                n, consumed = parse_frames(raw, acc_buf, gyr_buf, n)
+                del pending[:consumed]
+
+                # Stream decoded samples to disk and recycle the chunk buffer
+                if cap_fd is not None and n:
+                    records = np.empty(n, dtype=CAPTURE_DTYPE)
+                    records['a'] = acc_buf[:n]
+                    records['g'] = gyr_buf[:n]
+                    os.write(cap_fd, records.tobytes())
+                    total_written += n
+                    n = 0
             except Exception as e:
                 print(f"Error reading data: {e}")
                 break
-                
-        print(f"Collected {len(acceleration_points)} data points")
-        return np.array(timestamps), acceleration_points, gyroscope_points 
\ No newline at end of file
+
+        elapsed = time.monotonic() - start_time
+
+        if cap_fd is not None:
+            os.close(cap_fd)
+            n = total_written
+            if n:
+                # Map the capture back in read-only; the record fields are
+                # already SoA int16 views, no copy involved
+                records = np.memmap(capture_file, dtype=CAPTURE_DTYPE, mode='r')
+                acc_counts = records['a']
+                gyr_counts = records['g']
+            else:
+                acc_counts = acc_buf[:0]
+                gyr_counts = gyr_buf[:0]
+        else:
+            acc_counts = acc_buf[:n]
+            gyr_counts = gyr_buf[:n]
+
+        print(f"Collected {n} data points")
+
+        # Convert raw counts to physical units in a single vectorized pass,
+        # and lay the timestamps on an even grid over the measured elapsed
+        # time instead of reading the clock once per sample
+        timestamps = np.arange(n, dtype=np.float64) * (elapsed / max(n - 1, 1))
+        acceleration = acc_counts.astype(np.float32) * np.float32(ACCEL_SCALE)
+        gyroscope = gyr_counts.astype(np.float32) * np.float32(GYRO_SCALE)
+        return timestamps, acceleration, gyroscope 
\ No newline at end of file